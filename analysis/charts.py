@@ -0,0 +1,38 @@
+"""Shared Plotly figure factory for the ranked bar charts.
+
+The per-zip / per-neighborhood / per-type bar builders are near-clones,
+and each px.bar call pays Plotly Express introspection and schema
+validation. This module registers one reusable layout template and
+builds go.Bar traces directly, so every chart is a cheap two-line call.
+"""
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+pio.templates['cityunmasked'] = go.layout.Template(
+    layout=go.Layout(
+        coloraxis=dict(showscale=False),
+        showlegend=False,
+    )
+)
+
+
+def bar_ranked(labels, counts, colorscale, height,
+               orientation='v', title=None):
+    """Bar chart of counts colored by magnitude.
+
+    `orientation='h'` draws horizontal bars sorted smallest-to-largest,
+    matching the layout the px.bar versions used.
+    """
+    if orientation == 'h':
+        trace  = go.Bar(x=counts, y=labels, orientation='h',
+                        marker=dict(color=counts, colorscale=colorscale))
+        layout = go.Layout(template='cityunmasked', height=height,
+                           title=title,
+                           yaxis=dict(categoryorder='total ascending'))
+    else:
+        trace  = go.Bar(x=labels, y=counts,
+                        marker=dict(color=counts, colorscale=colorscale))
+        layout = go.Layout(template='cityunmasked', height=height,
+                           title=title)
+    return go.Figure(trace, layout)
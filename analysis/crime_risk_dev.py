@@ -207,13 +207,18 @@ def build_risk_heatmap(
             ).add_to(m)
 
     if top_points is not None and not top_points.empty:
-        for i, row in top_points.iterrows():
-            lat = row["lat_center"]
-            lon = row["lon_center"]
-            risk = row["risk_score"]
-            avg_future = row["avg_future_crimes"]
-            rank = row.get("rank", i + 1)
-
+        # zip over the raw arrays instead of iterrows() — no per-row
+        # Series construction.
+        ranks = (top_points["rank"].to_numpy()
+                 if "rank" in top_points.columns
+                 else np.arange(1, len(top_points) + 1))
+        for lat, lon, risk, avg_future, rank in zip(
+            top_points["lat_center"].to_numpy(),
+            top_points["lon_center"].to_numpy(),
+            top_points["risk_score"].to_numpy(),
+            top_points["avg_future_crimes"].to_numpy(),
+            ranks,
+        ):
             popup_text = (
                 f"Top {rank} hotspot<br>"
                 f"Risk score: {risk:.2f}<br>"
@@ -0,0 +1,72 @@
+"""Cached CSV ingestion shared by the load_* functions.
+
+First read parses the CSV with the multithreaded pyarrow engine and
+writes a Parquet sidecar next to it; later reads are a columnar load
+that skips CSV scanning and dtype inference entirely. The sidecar is
+invalidated whenever the CSV is newer.
+"""
+
+import hashlib
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 — presence check only
+    _CSV_ENGINE = 'pyarrow'
+    _HAVE_PARQUET = True
+except ImportError:
+    _CSV_ENGINE = 'c'
+    _HAVE_PARQUET = False
+
+
+def read_csv_cached(path, **read_kwargs):
+    """Read `path` via its Parquet sidecar when fresh, else parse and cache.
+
+    Read options (usecols, dtype, ...) are folded into the sidecar name so
+    changing them invalidates the cache rather than serving a stale shape.
+    """
+    stem = os.path.splitext(path)[0]
+    if read_kwargs:
+        key  = hashlib.md5(repr(sorted(read_kwargs.items()))
+                           .encode()).hexdigest()[:8]
+        stem = f'{stem}.{key}'
+    pq = stem + '.parquet'
+    if _HAVE_PARQUET and os.path.exists(pq) \
+            and os.path.getmtime(pq) >= os.path.getmtime(path):
+        return pd.read_parquet(pq)
+
+    df = pd.read_csv(path, engine=_CSV_ENGINE, **read_kwargs)
+    if _HAVE_PARQUET:
+        try:
+            df.to_parquet(pq)
+        except OSError:
+            pass  # read-only data dir — caching is best-effort
+    return df
+
+
+def prepared_frame_cached(name, sources, builder):
+    """Memoize a prepared DataFrame to cache/<name>.<key>.parquet.
+
+    `key` hashes the (path, mtime) of every source file, so editing a
+    source CSV invalidates the cached result. Used for frames whose
+    preparation (parsing, filtering, classification) costs more than the
+    raw read — a cache hit is a single columnar load.
+    """
+    if not _HAVE_PARQUET:
+        return builder()
+
+    key = hashlib.md5(repr(
+        [(s, os.path.getmtime(s)) for s in sources]
+    ).encode()).hexdigest()[:12]
+    pq = os.path.join('cache', f'{name}.{key}.parquet')
+    if os.path.exists(pq):
+        return pd.read_parquet(pq)
+
+    df = builder()
+    try:
+        os.makedirs('cache', exist_ok=True)
+        df.to_parquet(pq)
+    except OSError:
+        pass
+    return df
@@ -2,7 +2,32 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from sklearn.neighbors import BallTree
+from scipy.spatial import cKDTree
+
+from analysis.charts import bar_ranked
+
+try:
+    from numba import njit, prange
+    _HAVE_NUMBA = True
+except ImportError:          # numba is optional — fall back to cKDTree
+    prange = range
+    _HAVE_NUMBA = False
+
+
+def _to_planar_meters(lat, lon, lat0, lon0):
+    """Project lat/lon to local equirectangular meters centered on (lat0, lon0).
+
+    Accurate to well under a meter over a city-scale extent, which lets the
+    100m proximity joins run on a planar KD-tree instead of evaluating
+    haversine trig at every tree node.
+    """
+    # Up-cast float32 storage here: cKDTree works in float64 anyway, so
+    # handing it float64 avoids an internal copy, and the projection
+    # arithmetic keeps full precision of whatever came in.
+    x = (np.asarray(lon, dtype=np.float64) - lon0) \
+        * 111_320 * np.cos(np.radians(lat0))
+    y = (np.asarray(lat, dtype=np.float64) - lat0) * 110_540
+    return np.column_stack([x, y])
 
 
 # ── Build combined decay dataset ──────────────────────────────────────────────
@@ -28,57 +53,120 @@ def build_decay_index(unfit_clean, vacant):
 
 # ── Spatial joins ─────────────────────────────────────────────────────────────
 
+# Indexed by (near_unfit | near_vacant << 1)
+DECAY_ZONE_LABELS = ['Neither', 'Near Unfit Only', 'Near Vacant Only', 'Near Both']
+
+
+def _any_within(cx, cy, px, py, r2, out):
+    """out[i] = any (px, py) point within sqrt(r2) meters of (cx[i], cy[i]).
+
+    Embarrassingly parallel brute force with early exit on first hit —
+    compiled by Numba when available, where it beats building and
+    querying a tree at these set sizes.
+    """
+    for i in prange(cx.size):
+        hit = False
+        for j in range(px.size):
+            dx = cx[i] - px[j]
+            dy = cy[i] - py[j]
+            if dx * dx + dy * dy <= r2:
+                hit = True
+                break
+        out[i] = hit
+
+
+if _HAVE_NUMBA:
+    _any_within = njit(parallel=True, cache=True)(_any_within)
+
+
+def _mark_covered(tree, points_xy, radius, n):
+    """Boolean mask of the n indexed points within `radius` of any point."""
+    covered = np.zeros(n, dtype=bool)
+    hits = tree.query_ball_point(points_xy, r=radius)
+    if len(hits):
+        flat = np.concatenate([np.asarray(h, dtype=np.intp) for h in hits])
+        covered[flat] = True
+    return covered
+
 def run_spatial_joins(crime, unfit_clean, vacant):
     """
     Tag each crime with proximity flags:
       near_unfit, near_vacant, near_decay, decay_zone
-    Uses BallTree haversine at 100m radius.
+    Uses a planar cKDTree at 100m radius.
     """
-    c_coords = np.radians(crime[['LAT', 'LON']].values)
-
-    # Near unfit
-    u_coords   = np.radians(unfit_clean[['Latitude', 'Longitude']].values)
-    tree_unfit = BallTree(u_coords, metric='haversine')
-    crime['near_unfit'] = (
-        tree_unfit.query_radius(c_coords, r=100/6_371_000, count_only=True) > 0
+    lat0 = crime['LAT'].mean()
+    lon0 = crime['LON'].mean()
+    c_xy = _to_planar_meters(crime['LAT'].values, crime['LON'].values, lat0, lon0)
+    u_xy = _to_planar_meters(unfit_clean['Latitude'].values,
+                             unfit_clean['Longitude'].values, lat0, lon0)
+    v_xy = _to_planar_meters(vacant['lat'].values, vacant['lon'].values,
+                             lat0, lon0)
+
+    if _HAVE_NUMBA:
+        # Compiled early-exit scan across all cores — no tree to build.
+        cx = np.ascontiguousarray(c_xy[:, 0])
+        cy = np.ascontiguousarray(c_xy[:, 1])
+        near_unfit  = np.empty(len(c_xy), dtype=np.bool_)
+        near_vacant = np.empty(len(c_xy), dtype=np.bool_)
+        _any_within(cx, cy, np.ascontiguousarray(u_xy[:, 0]),
+                    np.ascontiguousarray(u_xy[:, 1]), 100.0 ** 2, near_unfit)
+        _any_within(cx, cy, np.ascontiguousarray(v_xy[:, 0]),
+                    np.ascontiguousarray(v_xy[:, 1]), 100.0 ** 2, near_vacant)
+        crime['near_unfit']  = near_unfit
+        crime['near_vacant'] = near_vacant
+    else:
+        # The decay sets are tiny compared to the crime table, so invert
+        # the join: index the crimes once and sweep each decay point's
+        # 100m disc over that tree.
+        crime_tree = cKDTree(c_xy)
+        crime['near_unfit']  = _mark_covered(crime_tree, u_xy, 100, len(c_xy))
+        crime['near_vacant'] = _mark_covered(crime_tree, v_xy, 100, len(c_xy))
+
+    # Combined zone label — one bitmask pass instead of four .loc scans,
+    # stored as Categorical so downstream groupbys work on int8 codes.
+    crime['near_decay'] = crime['near_unfit'] | crime['near_vacant']
+    zone_code = (
+        crime['near_unfit'].to_numpy(np.uint8) |
+        (crime['near_vacant'].to_numpy(np.uint8) << 1)
     )
-
-    # Near vacant
-    v_coords    = np.radians(vacant[['lat', 'lon']].values)
-    tree_vacant = BallTree(v_coords, metric='haversine')
-    crime['near_vacant'] = (
-        tree_vacant.query_radius(c_coords, r=100/6_371_000, count_only=True) > 0
+    crime['decay_zone'] = pd.Categorical.from_codes(
+        zone_code, DECAY_ZONE_LABELS
     )
 
-    # Combined zone label
-    crime['near_decay'] = crime['near_unfit'] | crime['near_vacant']
-    crime['decay_zone'] = 'Neither'
-    crime.loc[ crime['near_unfit'] & ~crime['near_vacant'], 'decay_zone'] = 'Near Unfit Only'
-    crime.loc[~crime['near_unfit'] &  crime['near_vacant'], 'decay_zone'] = 'Near Vacant Only'
-    crime.loc[ crime['near_unfit'] &  crime['near_vacant'], 'decay_zone'] = 'Near Both'
-
     return crime
 
 
-def assign_crime_zip(crime, decay):
-    """Assign each crime a zip code via nearest decay centroid (BallTree)."""
+def assign_crime_zip(crime, decay, c_rad=None):
+    """Assign each crime a zip code via nearest decay centroid.
+
+    Nearest-neighbor runs on the same planar projection as the proximity
+    joins — a cKDTree over ~15 centroids beats a haversine BallTree by
+    skipping trig at every node. `c_rad` is accepted for compatibility
+    with callers that precompute radian coordinates but is unused here.
+    """
     zip_centroids = (
         decay.groupby('zip_code')[['lat', 'lon']].mean()
         .reset_index().dropna()
     )
+    # Two byte-level scans instead of a per-row regex for "5 digits".
+    zips = zip_centroids['zip_code']
     zip_centroids = zip_centroids[
-        zip_centroids['zip_code'].str.match(r'^\d{5}$')
+        (zips.str.len() == 5) & zips.str.isdigit()
     ].reset_index(drop=True)
 
-    centroid_coords = np.radians(zip_centroids[['lat', 'lon']].values)
-    crime_coords    = np.radians(crime[['LAT', 'LON']].values)
+    lat0 = crime['LAT'].mean()
+    lon0 = crime['LON'].mean()
+    z_xy = _to_planar_meters(zip_centroids['lat'].values,
+                             zip_centroids['lon'].values, lat0, lon0)
+    c_xy = _to_planar_meters(crime['LAT'].values, crime['LON'].values,
+                             lat0, lon0)
 
-    tree   = BallTree(centroid_coords, metric='haversine')
-    _, idx = tree.query(crime_coords, k=1)
+    _, idx = cKDTree(z_xy).query(c_xy, k=1)
 
-    crime = crime.copy()
-    crime['zip_code'] = zip_centroids['zip_code'].iloc[idx.flatten()].values
-    return crime
+    # One C-level gather over the flat index array.
+    return crime.assign(
+        zip_code=zip_centroids['zip_code'].to_numpy().take(idx)
+    )
 
 
 # ── Neighborhood classification ───────────────────────────────────────────────
@@ -92,11 +180,14 @@ def classify_neighborhoods(crime, decay, unfit):
       Low Risk / Monitoring
     Returns DataFrame with composite risk score (0–100).
     """
-    crime_zip = crime.groupby('zip_code').size().reset_index(name='crime_count')
+    # value_counts hits a specialized C path that groupby().size() does not.
+    crime_zip = (crime['zip_code'].value_counts()
+                 .rename_axis('zip_code').reset_index(name='crime_count'))
 
+    # crosstab builds the wide counts directly — no MultiIndex Series
+    # materialized just to be unstacked again.
     decay_zip = (
-        decay.groupby(['zip_code', 'decay_type']).size()
-        .unstack(fill_value=0).reset_index()
+        pd.crosstab(decay['zip_code'], decay['decay_type']).reset_index()
     )
     decay_zip.columns.name = None
     if 'Unfit Property'  not in decay_zip.columns: decay_zip['Unfit Property']  = 0
@@ -106,14 +197,14 @@ def classify_neighborhoods(crime, decay, unfit):
         decay_zip['Unfit Property'] / decay_zip['decay_score'].replace(0, 1)
     )
 
-    unfit_z = unfit.copy()
-    unfit_z['zip_code'] = unfit_z['zip'].astype(str).str.strip()
-    unfit_z['is_open']  = unfit_z['status_type_name'] == 'Open'
-    unresolved = (
-        unfit_z.groupby('zip_code')
-        .agg(total_unfit=('is_open', 'count'), open_unfit=('is_open', 'sum'))
-        .reset_index()
-    )
+    # Group the open flag by zip directly — no copy of the unfit frame
+    # just to hold two derived columns.
+    zip_z   = unfit['zip'].astype(str).str.strip().rename('zip_code')
+    is_open = unfit['status_type_name'] == 'Open'
+    g = is_open.groupby(zip_z)
+    unresolved = pd.DataFrame(
+        {'total_unfit': g.count(), 'open_unfit': g.sum()}
+    ).reset_index()
     unresolved['pct_unresolved'] = unresolved['open_unfit'] / unresolved['total_unfit']
 
     nbr = decay_zip.merge(crime_zip, on='zip_code', how='left')
@@ -127,41 +218,38 @@ def classify_neighborhoods(crime, decay, unfit):
     crime_median = nbr['crime_count'].median()
     decay_median = nbr['decay_score'].median()
 
-    def classify(row):
-        high_crime  = row['crime_count'] > crime_median
-        high_decay  = row['decay_score'] > decay_median
-        unfit_heavy = row['unfit_ratio'] > 0.4
-        if high_crime and high_decay:   return 'Type A — Crime-Blight Feedback'
-        elif high_decay:                return 'Type B — Economic Abandonment'
-        elif unfit_heavy:               return 'Type C — Infrastructure Decay'
-        else:                           return 'Low Risk / Monitoring'
-
-    nbr['zone_type'] = nbr.apply(classify, axis=1)
-
-    def norm(s):
-        rng = s.max() - s.min()
-        return (s - s.min()) / rng if rng > 0 else s * 0
-
-    nbr['risk_score'] = (
-        norm(nbr['crime_count'])    * 0.40 +
-        norm(nbr['decay_score'])    * 0.35 +
-        norm(nbr['pct_unresolved']) * 0.25
-    ) * 100
+    high_crime  = nbr['crime_count'].to_numpy() > crime_median
+    high_decay  = nbr['decay_score'].to_numpy() > decay_median
+    unfit_heavy = nbr['unfit_ratio'].to_numpy() > 0.4
+    nbr['zone_type'] = pd.Categorical(np.select(
+        [high_crime & high_decay, high_decay, unfit_heavy],
+        ['Type A — Crime-Blight Feedback',
+         'Type B — Economic Abandonment',
+         'Type C — Infrastructure Decay'],
+        default='Low Risk / Monitoring'
+    ))
+
+    # Min-max normalize all three components in one block, then take a
+    # single weighted dot product instead of summing per-column Series.
+    comps = nbr[['crime_count', 'decay_score', 'pct_unresolved']] \
+        .to_numpy(np.float64)
+    mins  = comps.min(axis=0)
+    rng   = comps.max(axis=0) - mins
+    rng[rng == 0] = 1
+    nbr['risk_score'] = ((comps - mins) / rng) @ [0.40, 0.35, 0.25] * 100
 
     return nbr.sort_values('risk_score', ascending=False)
 
 
 def get_economic_abandonment_zones(crime, decay):
     """Vacant properties in bottom 25% crime-density zip codes."""
-    crime_zip = crime.groupby('zip_code').size().reset_index(name='crime_count')
-    threshold = crime_zip['crime_count'].quantile(0.25)
-    low_crime_zips = crime_zip[
-        crime_zip['crime_count'] <= threshold
-    ]['zip_code'].tolist()
+    crime_zip = crime['zip_code'].value_counts()
+    threshold = crime_zip.quantile(0.25)
+    low_crime_zips = crime_zip.index[crime_zip <= threshold].tolist()
     abandoned = decay[
         (decay['decay_type'] == 'Vacant Property') &
         (decay['zip_code'].isin(low_crime_zips))
-    ].copy()
+    ]
     return abandoned, low_crime_zips
 
 
@@ -253,9 +341,12 @@ def fig_decay_zone_crimes(crime):
 
 
 def fig_crime_type_by_zone(crime):
-    top_types = crime['CRIME_TYPE'].value_counts().head(5).index
-    df = (crime[crime['CRIME_TYPE'].isin(top_types)]
-          .groupby(['CRIME_TYPE', 'decay_zone']).size().reset_index())
+    # One crosstab covers both the top-type ranking and the per-zone
+    # counts — no separate value_counts pass or isin mask over the frame.
+    ct = pd.crosstab(crime['CRIME_TYPE'], crime['decay_zone'])
+    top_types = ct.sum(axis=1).nlargest(5).index
+    df = ct.loc[top_types.sort_values()].stack().rename('Count').reset_index()
+    df = df[df['Count'] > 0]
     df.columns = ['Crime Type', 'Zone', 'Count']
     fig = px.bar(df, x='Crime Type', y='Count', color='Zone',
                  color_discrete_map=ZONE_COLORS_DECAY, barmode='group',
@@ -267,11 +358,8 @@ def fig_crime_type_by_zone(crime):
 def fig_economic_abandonment(abandoned):
     if len(abandoned) == 0:
         return None
-    by_zip = abandoned['zip_code'].value_counts().head(8).reset_index()
-    by_zip.columns = ['Zip Code', 'Vacant Properties']
-    fig = px.bar(by_zip, x='Zip Code', y='Vacant Properties',
-                 color='Vacant Properties', color_continuous_scale='Blues',
-                 title="Economically Abandoned Vacancies — Low Crime Zips")
-    fig.update_layout(height=340, coloraxis_showscale=False)
-    return fig
+    by_zip = (abandoned.groupby('zip_code', sort=False, observed=True)
+              .size().nlargest(8))
+    return bar_ranked(by_zip.index, by_zip.values, 'Blues', 340,
+                      title="Economically Abandoned Vacancies — Low Crime Zips")
 
@@ -1,8 +1,52 @@
 import folium
-from folium.plugins import HeatMap
+import numpy as np
+from folium.plugins import FastMarkerCluster, HeatMap
 
+# Above this many unfit markers, render through FastMarkerCluster so the
+# client draws aggregated cluster icons instead of one SVG per property.
+_CLUSTER_THRESHOLD = 2000
 
-def build_map(crime, unfit_clean, vacant):
+# Leaflet-side marker factory for the clustered path — keeps the same
+# red/gray circle styling and tooltip as the individual markers.
+_CLUSTER_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+        radius: 5, color: row[2], fill: true, fillOpacity: 0.85
+    });
+    marker.bindTooltip(row[3]);
+    return marker;
+}
+"""
+
+
+def _heat_points(lat, lon, scale=4000):
+    """Snap points to a 1/scale-degree grid (~25m) and weight by count.
+
+    Leaflet's heatmap bins client-side anyway, so shipping every raw
+    point only inflates the payload; co-located points collapse to one
+    weighted entry.
+    """
+    cells = np.round(np.column_stack([lat, lon]) * scale).astype(np.int64)
+    uniq, counts = np.unique(cells, axis=0, return_counts=True)
+    return np.column_stack([uniq / scale, counts]).tolist()
+
+
+def heatmap_points(crime, vacant):
+    """Binned heat inputs for both layers, computed once per dataset.
+
+    Returned as a plain dict so callers (the map tab) can memoize it and
+    hand the same lists to every build_map call instead of re-binning on
+    each rerun.
+    """
+    return {
+        'crime':  _heat_points(crime['LAT'].to_numpy(),
+                               crime['LON'].to_numpy()),
+        'vacant': _heat_points(vacant['lat'].to_numpy(),
+                               vacant['lon'].to_numpy()),
+    }
+
+
+def build_map(crime, unfit_clean, vacant, heat=None):
     """
     Three-layer interactive Folium map:
       Layer 1 — Crime heatmap (all years)
@@ -11,28 +55,43 @@ def build_map(crime, unfit_clean, vacant):
     """
     m = folium.Map(location=[43.048, -76.147], zoom_start=13,
                    tiles='CartoDB positron')
+    if heat is None:
+        heat = heatmap_points(crime, vacant)
 
     # Crime heatmap
     crime_layer = folium.FeatureGroup(name='🌡️ Crime Heatmap')
-    HeatMap(crime[['LAT', 'LON']].values.tolist(),
+    HeatMap(heat['crime'],
             radius=10, blur=12, min_opacity=0.4).add_to(crime_layer)
     crime_layer.add_to(m)
 
     # Unfit property markers
+    # zip over the raw arrays instead of iterrows() — no per-row Series
+    # construction, and the open/closed colors come from one np.where.
     unfit_layer = folium.FeatureGroup(name='🔴 Unfit Properties')
-    for _, row in unfit_clean.iterrows():
-        color = 'red' if row.get('status_type_name') == 'Open' else 'gray'
-        folium.CircleMarker(
-            location=[row['Latitude'], row['Longitude']],
-            radius=5, color=color, fill=True, fill_opacity=0.85,
-            tooltip=f"UNFIT | {row['address']} | {row.get('status_type_name','?')} | {row['year']}"
-        ).add_to(unfit_layer)
+    status = unfit_clean['status_type_name'].to_numpy()
+    colors = np.where(status == 'Open', 'red', 'gray')
+    rows = zip(unfit_clean['Latitude'].to_numpy(),
+               unfit_clean['Longitude'].to_numpy(),
+               colors, unfit_clean['address'].to_numpy(),
+               status, unfit_clean['year'].to_numpy())
+    if len(unfit_clean) > _CLUSTER_THRESHOLD:
+        data = [[lat, lon, color, f"UNFIT | {addr} | {stat} | {year}"]
+                for lat, lon, color, addr, stat, year in rows]
+        FastMarkerCluster(data, callback=_CLUSTER_CALLBACK) \
+            .add_to(unfit_layer)
+    else:
+        for lat, lon, color, addr, stat, year in rows:
+            folium.CircleMarker(
+                location=[lat, lon],
+                radius=5, color=color, fill=True, fill_opacity=0.85,
+                tooltip=f"UNFIT | {addr} | {stat} | {year}"
+            ).add_to(unfit_layer)
     unfit_layer.add_to(m)
 
     # Vacant property heatmap
     vacant_layer = folium.FeatureGroup(name='🔵 Vacant Properties')
     HeatMap(
-        vacant[['lat', 'lon']].values.tolist(),
+        heat['vacant'],
         radius=8, blur=10, min_opacity=0.3,
         gradient={0.4: 'blue', 0.65: 'cyan', 1: 'aqua'}
     ).add_to(vacant_layer)
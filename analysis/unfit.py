@@ -1,16 +1,25 @@
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from sklearn.linear_model import LinearRegression
+
+from analysis.charts import bar_ranked
+
+from analysis.data_io import read_csv_cached
 
 
 def load_unfit():
     """Load and clean Unfit_Properties.csv."""
-    df = pd.read_csv("Unfit_Properties.csv")
+    df = read_csv_cached(
+        "Unfit_Properties.csv",
+        usecols=['address', 'zip', 'violation_date', 'status_type_name',
+                 'Latitude', 'Longitude']
+    )
     df['violation_date'] = pd.to_datetime(
-        df['violation_date'], format='mixed', utc=True
+        df['violation_date'], format='ISO8601', utc=True, cache=True
     )
-    df['year'] = df['violation_date'].dt.year
+    df['year'] = df['violation_date'].dt.year.astype('int16')
+    df['status_type_name'] = df['status_type_name'].astype('category')
     return df
 
 
@@ -22,7 +31,7 @@ def get_unfit_clean(unfit):
 # ── Charts ────────────────────────────────────────────────────────────────────
 
 def fig_unfit_by_year(unfit):
-    yearly = unfit.groupby('year').size().reset_index()
+    yearly = unfit.groupby('year', sort=False).size().reset_index()
     yearly.columns = ['Year', 'Count']
     fig = px.bar(yearly, x='Year', y='Count',
                  color='Count', color_continuous_scale='Oranges')
@@ -42,41 +51,36 @@ def fig_open_closed_pie(unfit):
 
 
 def fig_unfit_by_zip(unfit):
-    zips = unfit['zip'].value_counts().head(8).reset_index()
-    zips.columns = ['Zip Code', 'Count']
-    zips['Zip Code'] = zips['Zip Code'].astype(str)
-    fig = px.bar(zips, x='Zip Code', y='Count',
-                 color='Count', color_continuous_scale='Reds')
-    fig.update_layout(height=320, coloraxis_showscale=False)
-    return fig
+    zips = unfit.groupby('zip', sort=False).size().nlargest(8)
+    return bar_ranked(zips.index.astype(str), zips.values, 'Reds', 320)
 
 
 def fig_open_by_zip(unfit):
-    open_zips = (unfit[unfit['status_type_name'] == 'Open']['zip']
-                 .value_counts().head(8).reset_index())
-    open_zips.columns = ['Zip Code', 'Open Count']
-    open_zips['Zip Code'] = open_zips['Zip Code'].astype(str)
-    fig = px.bar(open_zips, x='Zip Code', y='Open Count',
-                 color='Open Count', color_continuous_scale='Reds')
-    fig.update_layout(height=320, coloraxis_showscale=False)
-    return fig
+    # Mask just the zip column — no filtered copy of the whole frame.
+    zips = unfit.loc[unfit['status_type_name'] == 'Open', 'zip']
+    open_zips = zips.groupby(zips, sort=False).size().nlargest(8)
+    return bar_ranked(open_zips.index.astype(str), open_zips.values,
+                      'Reds', 320)
 
 
 def fig_prediction(unfit):
     """Linear forecast of violations through 2027."""
-    yearly = unfit.groupby('year').size().reset_index()
+    yearly = unfit.groupby('year', sort=False).size().reset_index()
     yearly.columns = ['Year', 'Count']
     yearly_fit = yearly[yearly['Year'] <= 2024]
 
-    model  = LinearRegression().fit(yearly_fit[['Year']], yearly_fit['Count'])
-    future = pd.DataFrame({'Year': [2025, 2026, 2027]})
-    preds  = model.predict(future)
+    # Closed-form 1-D fit — identical math to LinearRegression without
+    # the sklearn validation/dispatch overhead on a 3-point predict.
+    slope, intercept = np.polyfit(yearly_fit['Year'].to_numpy(dtype=float),
+                                  yearly_fit['Count'].to_numpy(dtype=float), 1)
+    future_years = np.array([2025, 2026, 2027])
+    preds        = slope * future_years + intercept
 
     fig = go.Figure()
     fig.add_trace(go.Bar(x=yearly['Year'], y=yearly['Count'],
                          name='Actual', marker_color='#f97316'))
     fig.add_trace(go.Scatter(
-        x=future['Year'], y=preds,
+        x=future_years, y=preds,
         mode='lines+markers+text',
         text=[f"{int(p)}" for p in preds],
         textposition='top center',
@@ -87,5 +91,5 @@ def fig_prediction(unfit):
     fig.update_layout(title="Unfit Violations: Actual + Forecast",
                       xaxis_title="Year", yaxis_title="Violations",
                       height=420)
-    return fig, future['Year'].tolist(), [int(p) for p in preds]
+    return fig, future_years.tolist(), [int(p) for p in preds]
 
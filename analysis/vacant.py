@@ -1,10 +1,18 @@
 import pandas as pd
 import plotly.express as px
 
+from analysis.charts import bar_ranked
+
+from analysis.data_io import read_csv_cached
+
 
 def load_vacant():
     """Load and clean Vacant_Properties.csv."""
-    df = pd.read_csv("Vacant_Properties.csv")
+    df = read_csv_cached(
+        "Vacant_Properties.csv",
+        usecols=['PropertyAddress', 'Zip', 'neighborhood', 'VPR_valid',
+                 'Latitude', 'Longitude']
+    )
     df = df.dropna(subset=['Latitude', 'Longitude'])
     df = df.rename(columns={
         'Latitude':        'lat',
@@ -13,23 +21,20 @@ def load_vacant():
         'Zip':             'zip_code',
         'neighborhood':    'neighborhood'
     })
-    df['zip_code']  = df['zip_code'].astype(str).str.strip()
-    df['is_active'] = (
-        df['VPR_valid'].isna() | (df['VPR_valid'].str.strip() != 'Y')
-    )
+    df['zip_code']  = df['zip_code'].astype(str).str.strip().astype('category')
+    df['neighborhood'] = df['neighborhood'].astype('category')
+    # One comparison instead of isna-OR-inequality: eq() leaves missing
+    # registrations False, and anything not a valid 'Y' is active.
+    df['is_active'] = ~df['VPR_valid'].str.strip().eq('Y').fillna(False)
     return df
 
 
 # ── Charts ────────────────────────────────────────────────────────────────────
 
 def fig_vacant_by_neighborhood(vacant):
-    nbr = vacant['neighborhood'].value_counts().head(8).reset_index()
-    nbr.columns = ['Neighborhood', 'Count']
-    fig = px.bar(nbr, x='Count', y='Neighborhood', orientation='h',
-                 color='Count', color_continuous_scale='Blues')
-    fig.update_layout(yaxis={'categoryorder': 'total ascending'},
-                      coloraxis_showscale=False, height=380)
-    return fig
+    nbr = (vacant.groupby('neighborhood', sort=False, observed=True)
+           .size().nlargest(8))
+    return bar_ranked(nbr.index, nbr.values, 'Blues', 380, orientation='h')
 
 
 def fig_vacant_active_pie(vacant):
@@ -43,20 +48,14 @@ def fig_vacant_active_pie(vacant):
 
 
 def fig_vacant_by_zip(vacant):
-    zips = vacant['zip_code'].value_counts().head(8).reset_index()
-    zips.columns = ['Zip Code', 'Count']
-    fig = px.bar(zips, x='Zip Code', y='Count',
-                 color='Count', color_continuous_scale='Blues')
-    fig.update_layout(height=320, coloraxis_showscale=False)
-    return fig
+    zips = (vacant.groupby('zip_code', sort=False, observed=True)
+            .size().nlargest(8))
+    return bar_ranked(zips.index, zips.values, 'Blues', 320)
 
 
 def fig_vacant_active_by_zip(vacant):
-    active = (vacant[vacant['is_active']]['zip_code']
-              .value_counts().head(8).reset_index())
-    active.columns = ['Zip Code', 'Active Count']
-    fig = px.bar(active, x='Zip Code', y='Active Count',
-                 color='Active Count', color_continuous_scale='Reds')
-    fig.update_layout(height=320, coloraxis_showscale=False)
-    return fig
+    active = (vacant[vacant['is_active']]
+              .groupby('zip_code', sort=False, observed=True)
+              .size().nlargest(8))
+    return bar_ranked(active.index, active.values, 'Reds', 320)
 
@@ -1,8 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import streamlit as st
 from analysis.crime import load_crime
 from analysis.unfit import load_unfit, get_unfit_clean
 from analysis.vacant import load_vacant
 from analysis.code_violations import load_code_violations, add_violation_features
+from analysis.data_io import prepared_frame_cached
 from analysis.decay_index import (
     build_decay_index, run_spatial_joins, assign_crime_zip
 )
@@ -50,17 +54,40 @@ st.markdown("""
 
 
 # ── Load all data (cached) ─────────────────────────────────────────────────────
-@st.cache_data
+# cache_resource hands every session the same in-memory frames;
+# cache_data would pickle the tuple and deserialize a fresh copy per
+# rerun. The frames are read-only downstream — tabs derive via
+# assign/groupby/copy, never in place — so sharing is safe.
+@st.cache_resource(show_spinner=False)
 def load_all():
-    crime = load_crime()
-    unfit = load_unfit()
+    # The four loads are independent and the CSV/Parquet readers release
+    # the GIL, so overlap them — the read phase costs max() not sum().
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        crime_f  = ex.submit(load_crime)
+        unfit_f  = ex.submit(load_unfit)
+        vacant_f = ex.submit(load_vacant)
+        cv_f     = ex.submit(load_code_violations)
+        crime, unfit  = crime_f.result(), unfit_f.result()
+        vacant, cv    = vacant_f.result(), cv_f.result()
     unfit_clean = get_unfit_clean(unfit)
-    vacant = load_vacant()
-    cv = load_code_violations()
     decay = build_decay_index(unfit_clean, vacant)
-    crime = run_spatial_joins(crime, unfit_clean, vacant)
-    crime = assign_crime_zip(crime, decay)
-    crime = add_violation_features(crime, cv)
+
+    def _prepare_crime():
+        c = run_spatial_joins(crime, unfit_clean, vacant)
+        # Radian coordinates are shared by both BallTree steps below.
+        # BallTree ingests float64; convert once, C-contiguous, up front.
+        c_rad = np.radians(c[['LAT', 'LON']].to_numpy(dtype=np.float64))
+        c = assign_crime_zip(c, decay, c_rad=c_rad)
+        return add_violation_features(c, cv, c_rad=c_rad)
+
+    # Disk-cache the joined crime frame keyed on every source CSV, so a
+    # cold start with unchanged data skips the spatial joins entirely.
+    crime = prepared_frame_cached(
+        'crime_prepared',
+        ['crime_clean.csv', 'Unfit_Properties.csv', 'Vacant_Properties.csv',
+         'code_violations.csv'],
+        _prepare_crime
+    )
     return crime, unfit, unfit_clean, vacant, cv, decay
 
 
@@ -72,7 +99,6 @@ st.markdown("#  CityUnmasked — Syracuse Crime & Urban Decay Analysis")
 st.divider()
 
 # ── KPI row ────────────────────────────────────────────────────────────────────
-cols = st.columns(4)
 kpi_data = [
     ("Total Crimes",           f"{len(crime):,}",                                              "#f97316"),
     ("Crime Types",            str(crime['CRIME_TYPE'].nunique()),                             "#f97316"),
@@ -83,31 +109,39 @@ kpi_data = [
     # ("Active Vacancies",       str(int(vacant['is_active'].sum())),                            "#3b82f6"),
     # ("Near Any Decay (100m)",  f"{crime['near_decay'].mean()*100:.0f}%",                      "#dc2626"),
 ]
-for col, (label, val, color) in zip(cols, kpi_data):
-    with col:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-value" style="color:{color}">{val}</div>
-            <div class="metric-label">{label}</div>
-        </div>""", unsafe_allow_html=True)
+# One flex row in a single st.markdown — four separate column/markdown
+# calls meant four layout containers and four websocket messages per run.
+st.markdown(
+    '<div style="display:flex;gap:12px">'
+    + ''.join(
+        f'<div class="metric-card" style="flex:1">'
+        f'<div class="metric-value" style="color:{color}">{val}</div>'
+        f'<div class="metric-label">{label}</div></div>'
+        for label, val, color in kpi_data
+    )
+    + '</div>',
+    unsafe_allow_html=True
+)
 
 st.divider()
 
 # ── Tabs ───────────────────────────────────────────────────────────────────────
-tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-    "⚠️ Code Violations",
-    "🏚️ Unfit Properties",
-    "🏘️ Vacant Properties",
-    "📊 Crime Analysis",
-    "📉 Urban Decay Index",
-    "🗺️ Map",
-    "🔮 Prediction"
-])
+# st.tabs runs every tab body on every rerun — switching views rebuilt
+# all seven tabs' figures, maps and models each time. A radio-driven
+# dispatch renders only the selected view; revisits stay fast because
+# the heavy pieces are cached.
+_TAB_RENDERERS = {
+    "⚠️ Code Violations":  lambda: tab_code_violations.render(crime, cv),
+    "🏚️ Unfit Properties":  lambda: tab_unfit.render(unfit),
+    "🏘️ Vacant Properties": lambda: tab_vacant.render(vacant),
+    "📊 Crime Analysis":    lambda: tab_crime.render(crime),
+    "📉 Urban Decay Index": lambda: tab_decay_index.render(crime, decay, unfit),
+    "🗺️ Map":               lambda: tab_map.render(crime, unfit_clean, vacant),
+    "🔮 Prediction":        lambda: tab_prediction.render(unfit, crime),
+}
 
-with tab1: tab_code_violations.render(crime, cv)
-with tab2: tab_unfit.render(unfit)
-with tab3: tab_vacant.render(vacant)
-with tab4: tab_crime.render(crime)
-with tab5: tab_decay_index.render(crime, decay, unfit)
-with tab6: tab_map.render(crime, unfit_clean, vacant)
-with tab7: tab_prediction.render(unfit, crime)
\ No newline at end of file
+active_tab = st.radio(
+    "View", list(_TAB_RENDERERS), horizontal=True,
+    label_visibility="collapsed"
+)
+_TAB_RENDERERS[active_tab]()
\ No newline at end of file
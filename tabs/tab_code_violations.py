@@ -8,6 +8,18 @@ from analysis.code_violations import (
 )
 
 
+@st.cache_data(show_spinner=False, persist="disk")
+def _granger(crime, cv):
+    """The ADF/Granger OLS fits are deterministic — run once per dataset."""
+    return run_granger_causality(crime, cv)
+
+
+@st.cache_resource(show_spinner=False)
+def _figs(cv):
+    """Build the violation charts once per dataset."""
+    return fig_violations_by_zip(cv), fig_tier_pie(cv)
+
+
 def render(crime, cv):
     # ── Title & high-level framing ──────────────────────────────────────────────
     # st.markdown("### 🧱 Code Violations & Physical Decay")
@@ -60,13 +72,14 @@ Overgrowth, trash, exterior blight and visible abandonment.
     # st.markdown("---")
 
     # ── Row 1: Trend + composition ────────────────────────────────────────────
+    fig_zip, fig_pie = _figs(cv)
     col1, col2 = st.columns(2)
     with col1:
         st.markdown(
             '<div class="section-header-red">Top ZIP Codes by Violations</div>',
             unsafe_allow_html=True,
         )
-        st.plotly_chart(fig_violations_by_zip(cv), use_container_width=True)
+        st.plotly_chart(fig_zip, use_container_width=True)
         st.caption(
             "📌 13205, 13204, 13208 dominate — the same hotspots that appear in crime, unfit housing, and vacancy."
         )
@@ -77,7 +90,7 @@ Overgrowth, trash, exterior blight and visible abandonment.
             '<div class="section-header-red">Violation Mix by Tier</div>',
             unsafe_allow_html=True,
         )
-        st.plotly_chart(fig_tier_pie(cv), use_container_width=True)
+        st.plotly_chart(fig_pie, use_container_width=True)
         st.caption("Share of all violations that are structural, systems-related, or environmental neglect.")
 
     # ── Row 2: Where the problem is ───────────────────────────────────────────
@@ -130,7 +143,7 @@ Overgrowth, trash, exterior blight and visible abandonment.
 #         )
 
 #     # Adjust this unpacking if your actual function returns a different tuple
-    granger_results, _, ts, interpretation = run_granger_causality(crime, cv)
+    granger_results, _, ts, interpretation = _granger(crime, cv)
 
     # if interpretation:
     #     st.info(f"**Result:** {interpretation}")
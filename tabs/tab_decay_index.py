@@ -7,6 +7,14 @@ from analysis.decay_index import (
 )
 
 
+@st.cache_data(show_spinner=False, persist="disk")
+def _get_zone_tables(crime, decay, unfit):
+    """Classify zips and find abandonment zones once per data load."""
+    nbr = classify_neighborhoods(crime, decay, unfit)
+    abandoned, low_crime_zips = get_economic_abandonment_zones(crime, decay)
+    return nbr, abandoned, low_crime_zips
+
+
 def render(crime, decay, unfit):
     # st.markdown("### 📉 Urban Decay Index")
     st.caption("Every zip code classified by crime severity and decay level.")
@@ -26,8 +34,7 @@ def render(crime, decay, unfit):
         *Why this matters:* Type B zones prove blight has multiple causes. Different causes need different solutions.
         """)
 
-    nbr = classify_neighborhoods(crime, decay, unfit)
-    abandoned, low_crime_zips = get_economic_abandonment_zones(crime, decay)
+    nbr, abandoned, low_crime_zips = _get_zone_tables(crime, decay, unfit)
     stats = get_proximity_stats(crime)
 
     # ── Zone KPIs — keep just 4 ──────────────────────────────────
@@ -1,6 +1,14 @@
 import streamlit as st
 from streamlit_folium import st_folium
-from analysis.map_builder import build_map
+from analysis.map_builder import build_map, heatmap_points
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _map(crime, unfit_clean, vacant):
+    """Build the full Folium map once per dataset — heat binning,
+    markers and all — and share the object across reruns."""
+    return build_map(crime, unfit_clean, vacant,
+                     heat=heatmap_points(crime, vacant))
 
 
 def render(crime, unfit_clean, vacant):
@@ -16,5 +24,8 @@ def render(crime, unfit_clean, vacant):
         """)
 
     st.markdown('<div class="section-header">Crime Heatmap + Urban Decay Locations</div>', unsafe_allow_html=True)
-    st_folium(build_map(crime, unfit_clean, vacant), width=1100, height=580)
+    # returned_objects=[] skips serializing click/bounds state back to
+    # Python on every interaction — the map is display-only here.
+    st_folium(_map(crime, unfit_clean, vacant),
+              width=1100, height=580, returned_objects=[])
     st.success("🗺️ Northwest and southwest corridors show the strongest overlap of crime intensity and decay concentration — confirmed Type A intervention zones.")
\ No newline at end of file
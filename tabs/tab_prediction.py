@@ -3,9 +3,9 @@ from streamlit_folium import st_folium
 
 from analysis.crime_risk_dev import run_hotspot_model
 
-@st.cache_data
+@st.cache_data(show_spinner=False, persist="disk", max_entries=1)
 def get_hotspot_results():
-    """Train hotspot model once and cache results for the session."""
+    """Train hotspot model once and cache results — survives restarts."""
     return run_hotspot_model()
 
 
@@ -36,7 +36,7 @@ def render(unfit, crime):
 
     with col_map:
         st.markdown("**Risk Heatmap — Syracuse Grid (~400–500m cells)**")
-        st_folium(risk_map, width=900, height=600)
+        st_folium(risk_map, width=900, height=600, returned_objects=[])
         st.caption(
             "Colors show the predicted probability that each 400–500m grid cell "
             "becomes a crime cluster in Q4 (Oct–Dec). Red circles outline "